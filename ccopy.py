@@ -8,14 +8,24 @@ AS IS – No warranty. Use at your own risk.
 
 import sys
 import os
+import errno
+import mmap
 import time
+import queue
 import argparse
 import hashlib
 import logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 from pathlib import Path
 from datetime import date
-from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from threading import Lock, Thread
+from itertools import count
+from array import array
 
 # ============================================================
 # VERSION / LICENSE
@@ -31,6 +41,10 @@ __license__ = "Freeware"
 MAX_SAMPLE_BYTES = 1 * 1024**3   # 1 GB
 MAX_SAMPLE_FILES = 100
 DEFAULT_BUFFER_MB = 1
+MIN_BUFFER_BYTES = 64 * 1024
+DIRECT_MIN_BYTES = 64 * 1024**2  # --direct only pays off on large files
+SMALL_FILE_BYTES = 128 * 1024    # copied with one read + one write
+BENCH_BUFFERS_KB = (64, 128, 256, 512, 1024, 4096)
 DEFAULT_THREADS = 1
 MIN_PYTHON = (3, 9)
 
@@ -73,6 +87,67 @@ except ImportError:
                 size /= 1024
             return f"{size:.1f} PB"
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+
+def _iouring_usable():
+    # io_uring read/write needs Linux >= 5.6 plus the liburing bindings
+    if liburing is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        major, minor = os.uname().release.split(".")[:2]
+        return (int(major), int(minor)) >= (5, 6)
+    except (ValueError, AttributeError):
+        return False
+
+IOURING_OK = _iouring_usable()
+IOURING_DEPTH = 8
+
+# offset=None (use the fds' own offsets) is Linux-only sendfile
+# behavior; on macOS/FreeBSD it raises TypeError, not OSError, so the
+# fallback would never engage there. Mirror shutil and gate on Linux.
+USE_SENDFILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+MIN_HASH_MBPS = 500  # below this, stock OpenSSL likely lacks SHA-NI/CE
+
+
+def _pick_sha256():
+    """Select the SHA-256 constructor used for all hashing.
+
+    Some distros ship OpenSSL without SHA-NI dispatch, leaving
+    hashlib's SHA-256 ~4x slower than the hardware can do. Probe the
+    throughput once at import; if it is clearly below hardware speed,
+    prefer PyCryptodome's implementation, which bundles its own
+    accelerated core. Falls back to hashlib when PyCryptodome is not
+    installed.
+    """
+    block = b"\x00" * (1024 * 1024)
+    best = min(_time_once(block) for _ in range(3))
+    if best <= 1.0 / MIN_HASH_MBPS:
+        return hashlib.sha256, "hashlib"
+    try:
+        from Crypto.Hash import SHA256
+    except ImportError:
+        return hashlib.sha256, "hashlib"
+    return SHA256.new, "pycryptodome"
+
+
+def _time_once(block):
+    start = time.perf_counter()
+    hashlib.sha256(block).digest()
+    return time.perf_counter() - start
+
+
+sha256_new, HASH_BACKEND = _pick_sha256()
+
 # ============================================================
 # GLOBALS
 # ============================================================
@@ -176,40 +251,111 @@ def setup_logging(logfile=None, level="info"):
 # FILE COLLECTION
 # ============================================================
 
+SKIP_DIRS = {
+    "System Volume Information",
+    "$RECYCLE.BIN",
+    "Config.Msi",
+    "$WinREAgent",
+    "Recovery"
+}
+
+
+SCAN_THREADS = 16
+
+
+def scan_dir(d, paths, sizes, result_lock):
+    """Scan one directory; append its files to paths/sizes.
+
+    Returns (subdirs, local_bytes) so the caller can accumulate the
+    grand total without a second pass over the file list.
+
+    os.walk discards its DirEntry objects, forcing an extra stat(2)
+    per file. Scanning with os.scandir keeps them, and
+    entry.stat(follow_symlinks=False) is served from the directory
+    enumeration on most filesystems - no second syscall per file.
+    """
+    subdirs = []
+    local_paths = []
+    local_sizes = []
+    try:
+        with os.scandir(d) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.is_symlink():
+                        # follow the link: dangling links raise here and
+                        # are skipped with a warning, and the recorded
+                        # size is the target's, not the link's. Links to
+                        # directories are not descended (matches
+                        # os.walk's default).
+                        size = entry.stat().st_size
+                        if not entry.is_dir():
+                            local_paths.append(entry.path)
+                            local_sizes.append(size)
+                    else:
+                        local_paths.append(entry.path)
+                        local_sizes.append(entry.stat(follow_symlinks=False).st_size)
+                except OSError as e:
+                    logger.warning(f"Skipping unreadable file: {entry.path} ({e})")
+    except OSError as e:
+        logger.warning(f"Skipping unreadable dir: {d} ({e})")
+
+    with result_lock:
+        paths.extend(local_paths)
+        sizes.extend(local_sizes)
+    return subdirs, sum(local_sizes)
+
+
 def collect_files(base: Path):
-    result = []
-    SKIP_DIRS = {
-        "System Volume Information",
-        "$RECYCLE.BIN",
-        "Config.Msi",
-        "$WinREAgent",
-        "Recovery"
-    }
-
-    for root, dirs, names in os.walk(base):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-
-        for n in names:
-            p = Path(root) / n
-            try:
-                size = p.stat().st_size
-                result.append((p, size))
-            except OSError as e:
-                logger.warning(f"Skipping unreadable file: {p} ({e})")
-    return result
+    # Directories are independent, so keep up to SCAN_THREADS
+    # scandir+stat calls in flight - the scan is latency-bound on
+    # network filesystems and cold caches, not CPU-bound.
+    #
+    # Files are kept as parallel arrays (paths: list[str], sizes:
+    # packed uint64) instead of a list of (Path, int) tuples: on
+    # million-file trees the tuple-of-objects form costs ~100 bytes
+    # of scattered heap per file, the arrays a fraction of that.
+    paths = []
+    sizes = array("Q")
+    result_lock = Lock()
+    total_bytes = 0
+
+    with ThreadPoolExecutor(max_workers=SCAN_THREADS) as ex:
+        pending = {ex.submit(scan_dir, os.fspath(base), paths, sizes, result_lock)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                subdirs, local_bytes = fut.result()
+                total_bytes += local_bytes
+                for sub in subdirs:
+                    pending.add(ex.submit(scan_dir, sub, paths, sizes, result_lock))
+
+    if np is not None:
+        sizes = np.frombuffer(sizes, dtype=np.uint64)  # zero-copy view
+
+    return paths, sizes, total_bytes
 
 # ============================================================
 # SAMPLING
 # ============================================================
 
-def sample_files(file_entries):
+def sample_files(paths, sizes):
+    if np is not None and len(paths):
+        # vectorized: first index whose running total exceeds the cap
+        cum = np.cumsum(sizes)
+        idx = int(np.searchsorted(cum, MAX_SAMPLE_BYTES, side="right"))
+        idx = min(idx, MAX_SAMPLE_FILES)
+        total = int(cum[idx - 1]) if idx else 0
+        return [(Path(p), int(s)) for p, s in zip(paths[:idx], sizes[:idx])], total
+
     sample = []
     total = 0
-
-    for path, size in file_entries:
+    for path, size in zip(paths, sizes):
         if total + size > MAX_SAMPLE_BYTES:
             break
-        sample.append((path, size))
+        sample.append((Path(path), size))
         total += size
         if len(sample) >= MAX_SAMPLE_FILES:
             break
@@ -220,42 +366,395 @@ def sample_files(file_entries):
 # HASHING
 # ============================================================
 
+def open_noatime(path, flags):
+    """opener= hook: read without updating the source inode's atime.
+
+    O_NOATIME is refused unless we own the file, so fall back quietly.
+    """
+    if hasattr(os, "O_NOATIME"):
+        try:
+            return os.open(path, flags | os.O_NOATIME)
+        except (PermissionError, OSError):
+            pass
+    return os.open(path, flags)
+
+
 def sha256_stream(path, buf):
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        while chunk := f.read(buf):
-            h.update(chunk)
-    return h.hexdigest()
+    with open(path, "rb", buffering=0, opener=open_noatime) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: whole loop runs in C
+            return hashlib.file_digest(f, sha256_new).hexdigest()
+
+        h = sha256_new()
+        mv = memoryview(bytearray(buf))
+        while n := f.readinto(mv):
+            h.update(mv[:n])
+        return h.hexdigest()
 
 # ============================================================
 # COPY WORKER
 # ============================================================
 
-def copy_file(src, dst, size, buf, total_bar, do_verify, update_mode):
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    src_stat = src.stat()
+def parse_affinity(spec):
+    """Parse --affinity syntax like '0-3' or '0,2,4' into a CPU list."""
+    cpus = set()
+    for part in spec.split(","):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.update(range(int(lo), int(hi) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+_pin_counter = count()
+
+
+def pin_worker(cpus):
+    """Pin the calling worker thread to one CPU from cpus, round-robin.
+
+    Keeps each worker's copy buffer on the NUMA node it was allocated
+    on instead of chasing the thread across sockets.
+    """
+    if not cpus:
+        return
+    cpu = cpus[next(_pin_counter) % len(cpus)]
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            logger.warning(f"Could not pin worker to CPU {cpu} ({e})")
+    elif sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << cpu)
+
+
+PROGRESS_FLUSH_BYTES = 8 * 1024 * 1024
+
+
+FADV_DROP_BYTES = 64 * 1024**2
+SENDFILE_SPAN_BYTES = 128 * 1024**2
+
+
+HAS_FADVISE = hasattr(os, "posix_fadvise")
+
+
+def fadvise(fileno, offset, length, advice):
+    """Best-effort posix_fadvise; silently a no-op where unsupported."""
+    if HAS_FADVISE:
+        try:
+            os.posix_fadvise(fileno, offset, length, advice)
+        except OSError:
+            pass
+
+
+def write_all(fd, mv):
+    # raw (unbuffered) files may write fewer bytes than asked
+    while mv:
+        n = fd.write(mv)
+        mv = mv[n:]
+
+
+def effective_buffer(size, buf, fs_bsize=4096):
+    """Clamp the I/O buffer for one file.
 
-    if update_mode and dst.exists():
+    A 4 KiB file should not pay for a 1 MiB buffer allocation, but the
+    buffer never shrinks below 64 KiB or the filesystem block size.
+    """
+    return min(buf, max(size, MIN_BUFFER_BYTES, fs_bsize))
+
+
+class ProgressBatcher:
+    """Per-worker byte counter that feeds the shared progress bar.
+
+    Taking console_lock and formatting the tqdm bar for every chunk
+    serializes all copy threads on the bar. Workers instead accumulate
+    locally and flush to the bar only every PROGRESS_FLUSH_BYTES (and
+    once at the end of each file).
+    """
+
+    def __init__(self, bar):
+        self.bar = bar
+        self.pending = 0
+
+    def update(self, n):
+        self.pending += n
+        if self.pending >= PROGRESS_FLUSH_BYTES:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            with console_lock:
+                self.bar.update(self.pending)
+            self.pending = 0
+
+
+def copy_raw_iouring(fs, fd, size, buf, prog):
+    """Copy one open file through an io_uring submission ring.
+
+    Queues IOURING_DEPTH linked read->write pairs (one buffer each,
+    explicit offsets) per io_uring_enter, so a worker amortizes the
+    syscall cost over up to 2*IOURING_DEPTH I/O operations instead of
+    paying one syscall per read and write.
+    """
+    ring = liburing.io_uring()
+    liburing.io_uring_queue_init(IOURING_DEPTH * 2, ring, 0)
+    reported = 0
+    try:
+        iov = liburing.iovec(*(bytearray(buf) for _ in range(IOURING_DEPTH)))
+        cqe = liburing.io_uring_cqe()
+        offset = 0
+        while offset < size:
+            batch = 0
+            while batch < IOURING_DEPTH and offset < size:
+                n = min(buf, size - offset)
+                # user_data carries the expected length, with bit 0
+                # marking writes, so completions can be verified
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_read(
+                    sqe, fs.fileno(), iov[batch].iov_base, n, offset)
+                sqe.flags |= liburing.IOSQE_IO_LINK
+                sqe.user_data = n << 1
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_write(
+                    sqe, fd.fileno(), iov[batch].iov_base, n, offset)
+                sqe.user_data = (n << 1) | 1
+                offset += n
+                batch += 1
+            liburing.io_uring_submit(ring)
+
+            written = 0
+            for _ in range(batch * 2):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                res = cqe.res
+                expected, is_write = cqe.user_data >> 1, cqe.user_data & 1
+                liburing.io_uring_cqe_seen(ring, cqe)
+                if res < 0:
+                    raise OSError(-res, os.strerror(-res))
+                if res != expected:
+                    # a short read is legal for buffered io_uring reads
+                    # (common on 5.6-5.8 kernels), but the linked write
+                    # was prepped for the full length and would flush
+                    # stale buffer bytes - bail out before that counts
+                    # as a success
+                    op = "write" if is_write else "read"
+                    raise OSError(f"Short io_uring {op} ({res}/{expected})")
+                if is_write:
+                    written += res
+            prog.update(written)
+            reported += written
+    except Exception:
+        if reported == 0:
+            # Nothing reported yet - wipe any partial write so the
+            # caller can retry on the sendfile/read-write path
+            fs.seek(0)
+            fd.seek(0)
+            fd.truncate(0)
+        raise
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+
+def copy_raw(fs, fd, size, buf, prog):
+    """Copy an open src file to an open dst file without hashing.
+
+    Tries os.copy_file_range first, which lets the filesystem reflink
+    or copy in-kernel; then io_uring batching when the bindings and
+    kernel support it, then os.sendfile so the bytes never enter user
+    space; falls back to a plain read/write loop otherwise.
+    """
+    done = 0
+    if hasattr(os, "copy_file_range") and size:
+        try:
+            while done < size:
+                n = os.copy_file_range(
+                    fs.fileno(), fd.fileno(), size - done, done, done)
+                if n == 0:
+                    break
+                done += n
+                prog.update(n)
+            if done >= size:
+                return
+        except OSError as e:
+            # EXDEV: cross-filesystem on kernels < 5.3; the rest mean
+            # the FS/fd pair does not support in-kernel copies at all
+            if done or e.errno not in (
+                    errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+        if done:
+            # partially copied in-kernel - resume in user space
+            fs.seek(done)
+            fd.seek(done)
+
+    if not done and IOURING_OK and size:
         try:
-            dst_stat = dst.stat()
-            if dst_stat.st_size == size and abs(src_stat.st_mtime - dst_stat.st_mtime) < 2.0:
-                with console_lock:
-                    total_bar.update(size)
-                return 2 # Skipped
+            copy_raw_iouring(fs, fd, size, buf, prog)
+            return
         except OSError:
-            pass 
+            if fd.tell() or os.fstat(fd.fileno()).st_size:
+                raise
+            # clean failure before any write - fall through
+
+    if USE_SENDFILE:
+        # the GIL is released for the whole sendfile syscall, so copy
+        # big spans per call: with --threads N the workers then spend
+        # their time in parallel kernel copies, not reacquiring the GIL
+        span = max(buf, min(size, SENDFILE_SPAN_BYTES))
+        sent_any = False
+        try:
+            while n := os.sendfile(fd.fileno(), fs.fileno(), None, span):
+                sent_any = True
+                prog.update(n)
+            return
+        except OSError:
+            if sent_any:
+                raise
+            # sendfile not supported for this fd pair (e.g. some FS/
+            # platforms) - nothing written yet, so retry in user space
+            fs.seek(0)
+
+    mv = memoryview(bytearray(buf))
+    while n := fs.readinto(mv):
+        write_all(fd, mv[:n])
+        prog.update(n)
+
+
+def copy_direct(src, tmp, buf, h, prog):
+    """Copy src to tmp with O_DIRECT, bypassing the page cache.
+
+    Multi-GB copies through the page cache double memory pressure and
+    evict the working set for nothing - the cached data is never read
+    again. The bounce buffer is an anonymous mmap (page-aligned, as
+    O_DIRECT requires) and I/O sizes are page multiples; the unaligned
+    tail is written after clearing O_DIRECT on the destination fd.
+    """
+    align = mmap.PAGESIZE
+    buf = max(align, buf - buf % align)
+
+    src_fd = os.open(src, os.O_RDONLY | os.O_DIRECT)
+    try:
+        tmp_fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o666)
+    except OSError:
+        os.close(src_fd)
+        raise
+
+    mm = mmap.mmap(-1, buf)
+    mv = memoryview(mm)
+
+    def write_chunk(n):
+        if n % align:
+            # EOF tail: O_DIRECT cannot write a partial block
+            fl = fcntl.fcntl(tmp_fd, fcntl.F_GETFL)
+            fcntl.fcntl(tmp_fd, fcntl.F_SETFL, fl & ~os.O_DIRECT)
+        view = mv[:n]
+        while view:
+            view = view[os.write(tmp_fd, view):]
+        prog.update(n)
 
+    try:
+        # two specialized loops: the hash test is loop-invariant, so
+        # hoist it instead of re-checking per chunk
+        if h is not None:
+            while n := os.readv(src_fd, [mv]):
+                h.update(mv[:n])
+                write_chunk(n)
+        else:
+            while n := os.readv(src_fd, [mv]):
+                write_chunk(n)
+    finally:
+        mv.release()
+        mm.close()
+        os.close(src_fd)
+        os.close(tmp_fd)
+
+
+def copy_file(src, dst, size, buf, total_bar, do_verify, update_mode,
+              want_hash=False, direct=False):
+    """Copy src to dst. Returns (status, src_hexdigest_or_None).
+
+    want_hash makes the copy loop hash the source stream even when no
+    inline verify is requested, so --verify-after never has to reread
+    src. direct routes large files through O_DIRECT (see copy_direct).
+    """
     tmp = dst.with_suffix(dst.suffix + ".ccopy_tmp")
-    h = hashlib.sha256() if do_verify else None
+    h = sha256_new() if (do_verify or want_hash) else None
+    prog = ProgressBatcher(total_bar)
+
+    use_direct = (direct and fcntl is not None and hasattr(os, "O_DIRECT")
+                  and size >= DIRECT_MIN_BYTES)
 
     try:
-        with open(src, "rb") as fs, open(tmp, "wb") as fd:
-            while chunk := fs.read(buf):
-                fd.write(chunk)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        # inside the try: a source that vanished since the scan (e.g.
+        # a dangling symlink) must fail this one file, not the run
+        src_stat = src.stat()
+
+        if update_mode and dst.exists():
+            try:
+                dst_stat = dst.stat()
+                if dst_stat.st_size == size and abs(src_stat.st_mtime - dst_stat.st_mtime) < 2.0:
+                    with console_lock:
+                        total_bar.update(size)
+                    return 2, None # Skipped
+            except OSError:
+                pass
+
+        try:
+            if size <= SMALL_FILE_BYTES:
+                # one read, one write, one hash call - no chunk loop,
+                # no buffer sized for files far bigger than this one
+                data = src.read_bytes()
+                tmp.write_bytes(data)
                 if h:
-                    h.update(chunk)
-                with console_lock:
-                    total_bar.update(len(chunk))
+                    h.update(data)
+                prog.update(len(data))
+            else:
+                if use_direct:
+                    try:
+                        copy_direct(src, tmp, buf, h, prog)
+                    except OSError as e:
+                        # typically EINVAL: filesystem refuses O_DIRECT
+                        if e.errno != errno.EINVAL:
+                            raise
+                        logger.warning(f"O_DIRECT unsupported for {src}, using cached I/O")
+                        use_direct = False
+                        if h is not None:
+                            h = sha256_new()
+
+                if not use_direct:
+                    with open(src, "rb", buffering=0, opener=open_noatime) as fs, \
+                         open(tmp, "wb", buffering=0) as fd:
+                        # tell the kernel our access pattern: sequential
+                        # read (doubles readahead), and prefetch big files
+                        if hasattr(os, "posix_fadvise"):
+                            fadvise(fs.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                            if size >= DIRECT_MIN_BYTES:
+                                fadvise(fs.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+                        if h is None:
+                            copy_raw(fs, fd, size, buf, prog)
+                        else:
+                            # one reusable buffer: readinto avoids allocating
+                            # a fresh bytes object of len(buf) per chunk
+                            mv = memoryview(bytearray(buf))
+                            done = dropped = 0
+                            while n := fs.readinto(mv):
+                                write_all(fd, mv[:n])
+                                h.update(mv[:n])
+                                prog.update(n)
+                                done += n
+                                if done - dropped >= FADV_DROP_BYTES:
+                                    # evict what we already copied so a big
+                                    # copy does not flush the page cache
+                                    if hasattr(os, "posix_fadvise"):
+                                        span = done - dropped
+                                        fadvise(fs.fileno(), dropped, span,
+                                                os.POSIX_FADV_DONTNEED)
+                                        fadvise(fd.fileno(), dropped, span,
+                                                os.POSIX_FADV_DONTNEED)
+                                    dropped = done
+        finally:
+            prog.flush()
 
         tmp.replace(dst)
         os.utime(dst, (src_stat.st_atime, src_stat.st_mtime))
@@ -264,28 +763,42 @@ def copy_file(src, dst, size, buf, total_bar, do_verify, update_mode):
             if h.hexdigest() != sha256_stream(dst, buf):
                 raise RuntimeError("Verification failed")
 
-        return 1 # Copied
+        return 1, (h.hexdigest() if h else None) # Copied
 
     except Exception as e:
         logger.error(f"Copy failed: {src} -> {dst} ({e})")
         if tmp.exists():
             tmp.unlink(missing_ok=True)
-        return 0 # Failed
+        return 0, None # Failed
 
 # ============================================================
 # BENCHMARK
 # ============================================================
 
-def benchmark(sample, buf, verify):
-    start = time.time()
-    total = 0
-    for f, size in sample:
+def benchmark(sample, buf, verify, threads=1):
+    """Measure read(+hash) throughput over the sample in MB/s.
+
+    The sample is pushed through a pool of the candidate thread count,
+    so each sweep point reports what --threads N can actually sustain
+    rather than the single-threaded Python floor - otherwise --auto is
+    biased toward small settings.
+    """
+    def read_one(item):
+        f, size = item
         try:
-            with open(f, "rb") as fd:
+            with open(f, "rb", buffering=0, opener=open_noatime) as fd:
                 while fd.read(buf): pass
             if verify: sha256_stream(f, buf)
-            total += size
-        except OSError: pass
+            return size
+        except OSError:
+            return 0
+
+    start = time.time()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as ex:
+            total = sum(ex.map(read_one, sample))
+    else:
+        total = sum(map(read_one, sample))
     elapsed = time.time() - start
     return (total / 1024**2) / elapsed if elapsed > 0 else 0
 
@@ -311,10 +824,15 @@ def main():
     parser.add_argument("--verify-after", action="store_true")
     parser.add_argument("--move", action="store_true")
     parser.add_argument("--update", action="store_true", help="Skip files that exist with same size/time")
+    parser.add_argument("--direct", action="store_true", help="Bypass the page cache (O_DIRECT) for files >= 64 MiB")
     parser.add_argument("--log", nargs='?', const="AUTO", help="Log file path or directory.")
     parser.add_argument("--log-level", choices=["info", "debug"], default="info")
     parser.add_argument("--threads", type=int, default=DEFAULT_THREADS)
-    parser.add_argument("--buffer", type=int, default=DEFAULT_BUFFER_MB)
+    parser.add_argument("--verify-threads", type=int, default=0,
+                        help="Threads for --verify-after hashing (default: --threads)")
+    parser.add_argument("--affinity", help="Pin workers to CPUs, e.g. 0-3 or 0,2,4")
+    parser.add_argument("--buffer", type=float, default=DEFAULT_BUFFER_MB,
+                        help="Buffer size in MiB (fractions allowed, e.g. 0.25)")
 
     args = parser.parse_args()
     check_python()
@@ -342,38 +860,49 @@ def main():
 
     logger.info(f"CCopy {__version__} started")
 
-    files = collect_files(args.source)
-    total_bytes = sum(size for _, size in files)
-    if not files:
+    paths, sizes, total_bytes = collect_files(args.source)
+    if not paths:
         print("No files found.")
         sys.exit(0)
 
-    sample, sample_bytes = sample_files(files)
+    sample, sample_bytes = sample_files(paths, sizes)
 
     if args.dry_run:
-        print(f"\nDry-run summary: {len(files)} files / {total_bytes / 1024**3:.2f} GB")
+        print(f"\nDry-run summary: {len(paths)} files / {total_bytes / 1024**3:.2f} GB")
         sys.exit(0)
 
     if args.benchmark or args.auto:
         print("\nBenchmarking...")
         results = []
         for t in (1, 2, 4):
-            for b in (1, 2):
-                speed = benchmark(sample, b*1024*1024, args.verify)
-                results.append((t, b, speed))
-        
-        safe = min(results, key=lambda x: abs(x[0]-2) + abs(x[1]-2))
-        
+            for kb in BENCH_BUFFERS_KB:
+                speed = benchmark(sample, kb * 1024, args.verify, t)
+                results.append((t, kb, speed))
+
+        safe = min(results, key=lambda x: (abs(x[0]-2), abs(x[1]-1024)))
+
         if args.benchmark:
-            for t, b, s in results: print(f"T={t} B={b}MB -> {s:.1f} MB/s")
-        
-        print(f"\nRecommended SAFE: --threads {safe[0]} --buffer {safe[1]} --verify-after")
-        
+            for t, kb, s in results: print(f"T={t} B={kb}KB -> {s:.1f} MB/s")
+
+        print(f"\nRecommended SAFE: --threads {safe[0]} --buffer {safe[1]/1024:g} --verify-after")
+
         if args.auto:
-            args.threads, args.buffer = safe[0], safe[1]
+            args.threads, args.buffer = safe[0], safe[1] / 1024
             args.verify_after = True
 
-    buf = args.buffer * 1024 * 1024
+    buf = int(args.buffer * 1024 * 1024)
+
+    try:
+        fs_bsize = os.statvfs(args.source).f_bsize
+    except (AttributeError, OSError):
+        fs_bsize = 4096
+
+    affinity_cpus = None
+    if args.affinity:
+        try:
+            affinity_cpus = parse_affinity(args.affinity)
+        except ValueError:
+            fatal(f"Invalid --affinity spec: {args.affinity}")
     copied = []
     
     print(f"\nRunning CCopy {__version__}")
@@ -384,57 +913,107 @@ def main():
     fail_count = 0
     skipped_count = 0
 
+    # Verify pipeline: copy workers enqueue finished files, verify
+    # workers hash dst while the next files are still being copied.
+    # On separate src/dst disks this overlaps the whole verify phase
+    # with the copy phase instead of running it afterwards.
+    verify_threads = []
+    verify_queue = None
+    verify_state = {"done": 0, "ok": 0, "fail": 0}
+    if args.verify_after:
+        n_verify = args.verify_threads or args.threads
+        verify_queue = queue.Queue(maxsize=n_verify * 4)
+
+        def verify_worker():
+            pin_worker(affinity_cpus)
+            while True:
+                item = verify_queue.get()
+                try:
+                    if item is None:
+                        return
+                    # src was hashed while copying - only dst needs a
+                    # reread, and hashlib hashes GIL-free in threads
+                    src, dst, src_digest = item
+                    ok = False
+                    try:
+                        ok = src_digest == sha256_stream(dst, buf)
+                        if not ok:
+                            logger.error(f"Verification failed: {src}")
+                    except OSError as e:
+                        logger.error(f"Error verification: {src} ({e})")
+                    with stats_lock:
+                        verify_state["done"] += 1
+                        verify_state["ok" if ok else "fail"] += 1
+                finally:
+                    verify_queue.task_done()
+
+        verify_threads = [Thread(target=verify_worker, daemon=True)
+                          for _ in range(n_verify)]
+        for t in verify_threads:
+            t.start()
+
     try:
         with tqdm(total=total_bytes, unit="B", unit_scale=True, desc="COPY") as total:
             def worker(item):
                 nonlocal success_count, fail_count, skipped_count
-                src, size = item
+                src_path, size = item
+                src = Path(src_path)
+                size = int(size)
                 dst = args.dest / src.relative_to(args.source)
-                
-                res = copy_file(src, dst, size, buf, total, args.verify, args.update)
-                
+
+                res, digest = copy_file(src, dst, size,
+                                        effective_buffer(size, buf, fs_bsize),
+                                        total, args.verify, args.update,
+                                        want_hash=args.verify_after,
+                                        direct=args.direct)
+
                 with stats_lock:
-                    if res == 1: pass 
+                    if res == 1: pass
                     elif res == 2: skipped_count += 1
                     else: fail_count += 1
                     total.set_postfix(Skip=skipped_count, Fail=fail_count)
-                return (res, src, dst)
+                return (res, src, dst, digest)
 
-            with ThreadPoolExecutor(max_workers=args.threads) as ex:
-                for res_code, s, d in ex.map(worker, files):
+            with ThreadPoolExecutor(max_workers=args.threads,
+                                    initializer=pin_worker,
+                                    initargs=(affinity_cpus,)) as ex:
+                for res_code, s, d, digest in ex.map(worker, zip(paths, sizes)):
                     if res_code == 1:
-                        copied.append((s, d))
+                        copied.append((s, d, digest))
                         success_count += 1
-        
-        # VERIFICATION
+                        if verify_queue is not None:
+                            verify_queue.put((s, d, digest))
+
+        # VERIFICATION (drain whatever the pipeline has not hashed yet)
         if args.verify_after and copied:
             print(f"\nPost-copy verification ({len(copied)} files)...")
-            verify_ok = 0
-            verify_fail = 0
             with tqdm(total=len(copied), unit="file", desc="VERIFY") as pbar:
-                for src, dst in copied:
-                    is_ok = False
-                    try:
-                        if sha256_stream(src, buf) == sha256_stream(dst, buf):
-                            is_ok = True
-                        else:
-                            logger.error(f"Verification failed: {src}")
-                    except OSError as e:
-                        logger.error(f"Error verification: {src} ({e})")
-                    
-                    if is_ok:
-                        verify_ok += 1
-                    else:
-                        verify_fail += 1
-                        fail_count += 1
-                        success_count -= 1
-
-                    pbar.set_postfix(OK=verify_ok, Skip=skipped_count, Fail=fail_count)
-                    pbar.update(1)
+                shown = 0
+                while True:
+                    with stats_lock:
+                        done = verify_state["done"]
+                        verify_ok = verify_state["ok"]
+                        verify_fail = verify_state["fail"]
+                    pbar.update(done - shown)
+                    shown = done
+                    pbar.set_postfix(OK=verify_ok, Skip=skipped_count,
+                                     Fail=fail_count + verify_fail)
+                    if done >= len(copied):
+                        break
+                    time.sleep(0.1)
+
+            fail_count += verify_fail
+            success_count -= verify_fail
+
+        if verify_queue is not None:
+            for _ in verify_threads:
+                verify_queue.put(None)
+            for t in verify_threads:
+                t.join()
 
         # MOVE DELETE
         if args.move:
-            for src, dst in copied:
+            for src, dst, _ in copied:
                 try:
                     src.unlink()
                 except OSError as e: